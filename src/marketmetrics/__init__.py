@@ -1,66 +1,217 @@
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 import yfinance as yf
+import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-import mplcursors
+from matplotlib.lines import Line2D
+from matplotlib.markers import MarkerStyle
 import signal
 import sys
 import pandas as pd
 import numpy as np
 from .config import config_from_dialog, Config
-from .calculator import calculate_rsi, calculate_macd
+from .history import fetch_history
+from .downsample import downsample
+from .calculator import (
+    calculate_rsi,
+    calculate_macd,
+    calculate_rolling_mean_std,
+    calculate_moving_average,
+    calculate_crosses,
+)
 
 
 TRADING_DAYS_IN_YEAR = 252
 NA_ANNUAL_VOLATILITY = 0.0
 YEAR_IN_DAYS = 365
+BOLLINGER_WINDOW = 20
+FIB_RATIOS = np.array([0.236, 0.382, 0.5, 0.618, 0.786])
+NON_INTERACTIVE_BACKENDS = ("agg", "cairo", "pdf", "pgf", "ps", "svg", "template")
+MAX_FETCH_WORKERS = 8
+
+
+def _rsi_color(value: float) -> str:
+    if value <= 30:
+        return "forestgreen"
+    if value >= 70:
+        return "tomato"
+    return "cornflowerblue"
+
+
+def _scatter_markers(ax, groups):
+    # Draw all marker groups of an axes as one PathCollection with per-point
+    # colours and marker paths, and return legend proxies for the groups.
+    # Each group is (x, y, color, marker, label).
+    paths = []
+    colors = []
+    handles = []
+    for _x, y, color, marker, label in groups:
+        style = MarkerStyle(marker)
+        paths += [style.get_path().transformed(style.get_transform())] * len(y)
+        colors += [color] * len(y)
+        handles.append(
+            Line2D(
+                [],
+                [],
+                linestyle="none",
+                marker=marker,
+                markerfacecolor=color,
+                markeredgecolor="black",
+                label=label,
+            )
+        )
+    collection = ax.scatter(
+        np.concatenate([np.asarray(x, dtype=np.float64) for x, *_ in groups]),
+        np.concatenate([np.asarray(y, dtype=np.float64) for _x, y, *_ in groups]),
+        c=colors,
+        edgecolors="black",
+    )
+    collection.set_paths(paths)
+    return handles
+
+
+def _connect_hover(fig, x, x_labels, series):
+    # Annotate the point nearest to the mouse with "<date> : <value>". `series`
+    # maps each axes to its y values and an optional text colour function.
+    # Instead of redrawing all four axes on every hover, the rendered figure is
+    # cached on each full draw and only the annotation is blitted over it.
+    # Canvases that can't blit (e.g. GTK4, WebAgg) fall back to a full redraw.
+    canvas = fig.canvas
+    blit = canvas.supports_blit
+
+    annotations = {
+        ax: ax.annotate(
+            "",
+            xy=(0, 0),
+            xytext=(15, 15),
+            textcoords="offset points",
+            bbox=dict(boxstyle="round,pad=0.3", edgecolor="black", facecolor="white"),
+            animated=blit,
+            visible=False,
+        )
+        for ax in series
+    }
+    background = None
+    shown = None
+
+    def on_draw(_event):
+        nonlocal background, shown
+        background = canvas.copy_from_bbox(fig.bbox)
+        shown = None
+
+    def on_move(event):
+        nonlocal shown
+        if blit and background is None:
+            return
+        ax = event.inaxes
+        idx = None
+        if ax in series and event.xdata is not None:
+            idx = int(np.searchsorted(x, event.xdata))
+            if idx == len(x) or (
+                idx > 0 and event.xdata - x[idx - 1] < x[idx] - event.xdata
+            ):
+                idx -= 1
+            if np.isnan(series[ax][0][idx]):
+                idx = None
+        target = None if idx is None else (ax, idx)
+        if target == shown:
+            return
+
+        for annotation in annotations.values():
+            annotation.set_visible(False)
+        if target is not None:
+            y, color = series[ax]
+            annotation = annotations[ax]
+            # Flip the label to the left on the right half so it stays visible.
+            right = idx > len(x) // 2
+            annotation.xy = (x[idx], y[idx])
+            annotation.set_position((-15 if right else 15, 15))
+            annotation.set_horizontalalignment("right" if right else "left")
+            annotation.set_text(f"{x_labels[idx]} : {y[idx]:.2f}")
+            annotation.set_color(color(y[idx]) if color else "black")
+            annotation.set_visible(True)
+        if blit:
+            canvas.restore_region(background)
+            if target is not None:
+                ax.draw_artist(annotation)
+            canvas.blit(fig.bbox)
+        else:
+            canvas.draw_idle()
+        shown = target
+
+    if blit:
+        canvas.mpl_connect("draw_event", on_draw)
+    canvas.mpl_connect("motion_notify_event", on_move)
 
 
 def plot_stock_data(
     symbol: str,
+    company_history: pd.DataFrame,
     period: str,
     period_in_days: int,
-    start: str,
-    end: str,
     short_window: int,
     long_window: int,
     figsize: tuple,
 ):
-    company = yf.Ticker(symbol)
-    company_history = company.history(interval="1d", start=start, end=end)
-    company_close_prices: pd.Series = company_history["Close"]
-    company_volume = company_history["Volume"]
+    # Work on plain arrays; pandas only adds dispatch and alignment overhead here.
+    close_values = company_history["Close"].to_numpy(np.float64)
+    volume_values = company_history["Volume"].to_numpy(np.float64)
 
-    daily_volatility = company_close_prices.pct_change().std()
+    daily_returns = np.diff(close_values) / close_values[:-1]
+    # Like Series.std(), a sample std of fewer than two returns is quietly NaN.
+    daily_volatility = np.nan
+    if np.count_nonzero(~np.isnan(daily_returns)) > 1:
+        daily_volatility = np.nanstd(daily_returns, ddof=1)
     annual_volatility = NA_ANNUAL_VOLATILITY
     if period_in_days >= YEAR_IN_DAYS:
         annual_volatility = daily_volatility * np.sqrt(TRADING_DAYS_IN_YEAR)
 
-    short_ma = company_close_prices.rolling(window=short_window).mean()
-    long_ma = company_close_prices.rolling(window=long_window).mean()
-    golden_cross = (short_ma.shift(1) < long_ma.shift(1)) & (short_ma > long_ma)
-    death_cross = (short_ma.shift(1) > long_ma.shift(1)) & (short_ma < long_ma)
-
-    rsi = calculate_rsi(company_close_prices)
-    macd, signal_line = calculate_macd(company_close_prices)
-
-    max_price = company_close_prices.max()
-    min_price = company_close_prices.min()
-    mean_price = company_close_prices.mean()
-    max_dates = company_close_prices[company_close_prices == max_price].index
-    min_dates = company_close_prices[company_close_prices == min_price].index
-
     # Calculate Bollinger Bands
-    rolling_mean = company_close_prices.rolling(window=20).mean()
-    rolling_std = company_close_prices.rolling(window=20).std()
+    rolling_mean, rolling_std = calculate_rolling_mean_std(
+        close_values, window=BOLLINGER_WINDOW
+    )
     upper_band = rolling_mean + (rolling_std * 2)
     lower_band = rolling_mean - (rolling_std * 2)
 
+    # Reuse the Bollinger mean, or the short MA, when the windows coincide
+    # (e.g. the common 20 day short window) instead of recomputing them.
+    moving_averages = {BOLLINGER_WINDOW: rolling_mean}
+    for window in (short_window, long_window):
+        if window not in moving_averages:
+            moving_averages[window] = calculate_moving_average(close_values, window)
+    short_ma = moving_averages[short_window]
+    long_ma = moving_averages[long_window]
+    ma_crosses = calculate_crosses(short_ma, long_ma)
+    golden_cross = np.nonzero(ma_crosses == 1)[0]
+    death_cross = np.nonzero(ma_crosses == -1)[0]
+
+    rsi = calculate_rsi(close_values)
+    macd, signal_line = calculate_macd(close_values)
+
+    max_idx = int(close_values.argmax())
+    min_idx = int(close_values.argmin())
+    # argmax/argmin stop at the first NaN; only then pay for the NaN-aware scan.
+    if np.isnan(close_values[max_idx]):
+        max_idx = int(np.nanargmax(close_values))
+        min_idx = int(np.nanargmin(close_values))
+    max_price = close_values[max_idx]
+    min_price = close_values[min_idx]
+    mean_price = np.nanmean(close_values)
+
     # Calculate Fibonacci retracement levels
-    fib_levels = [
-        max_price - (max_price - min_price) * level
-        for level in [0.236, 0.382, 0.5, 0.618, 0.786]
-    ]
+    fib_levels = max_price - (max_price - min_price) * FIB_RATIOS
+    fib_labels = np.array([f"{ratio * 100:.1f}%" for ratio in FIB_RATIOS])
+
+    # Shared by every axis, plot call and hover annotation so dates are converted
+    # to matplotlib date numbers and formatted once per figure.
+    date_formatter = mdates.DateFormatter("%Y-%m-%d")
+    date_nums = mdates.date2num(company_history.index.to_pydatetime())
+    date_strs = company_history.index.strftime("%Y-%m-%d").to_numpy()
+
+    # Hover annotations only make sense when the figure is shown in a window.
+    interactive = matplotlib.get_backend().lower() not in NON_INTERACTIVE_BACKENDS
 
     fig = plt.figure(figsize=figsize)
     main_ax = fig.add_subplot(6, 1, (1, 3))
@@ -70,97 +221,81 @@ def plot_stock_data(
 
     # Plotting stock price, moving averages, and Bollinger Bands
     main_ax.plot(
-        company_history.index,
-        short_ma,
+        *downsample(date_nums, short_ma),
         label=f"{short_window} day MA",
         color="blue",
         linewidth=1,
     )
     main_ax.plot(
-        company_history.index,
-        long_ma,
+        *downsample(date_nums, long_ma),
         label=f"{long_window} day MA",
         color="red",
         linewidth=1,
     )
-    main_closing_line = main_ax.plot(
-        company_history.index,
-        company_close_prices,
+    main_ax.plot(
+        *downsample(date_nums, close_values),
         label="Closing",
         color="dimgrey",
         linewidth=1,
     )
     main_ax.fill_between(
-        company_history.index,
+        date_nums,
         lower_band,
         upper_band,
         color="darkgray",
         alpha=0.1,
         label="Bollinger Bands",
     )
-    main_ax.scatter(
-        company_history.index[golden_cross],
-        company_close_prices[golden_cross],
-        color="green",
-        marker="^",
-        label="Golden Cross",
-        edgecolors="black",
-    )
-    main_ax.scatter(
-        company_history.index[death_cross],
-        company_close_prices[death_cross],
-        color="red",
-        marker="v",
-        label="Death Cross",
-        edgecolors="black",
-    )
-    main_ax.scatter(
-        max_dates,
-        [max_price] * len(max_dates),
-        color="gold",
-        marker="o",
-        label="Max Price",
-        edgecolors="black",
-    )
-    main_ax.scatter(
-        min_dates,
-        [min_price] * len(min_dates),
-        color="crimson",
-        marker="o",
-        label="Min Price",
-        edgecolors="black",
-    )
     main_ax.axhline(mean_price, color="green", linewidth=1, label="Mean Price")
 
     # Plot Fibonacci retracement levels and add buy/sell signals
-    for level, value in zip([0.236, 0.382, 0.5, 0.618, 0.786], fib_levels):
-        main_ax.axhline(
-            value,
-            linestyle="dotted",
-            color="purple",
-            linewidth=1,
-            label=f"Fib {level * 100:.1f}%",
-        )
-        # Move the buy/sell signals slightly to the right for better visibility
-        signal_date = company_history.index[-1] + pd.Timedelta(days=10)
-        if company_close_prices.iloc[-1] > value:
-            main_ax.scatter(
-                signal_date,
-                value,
-                color="green",
-                marker="^",
-                label=f"Buy Signal (Fib {level * 100:.1f}%)",
-                edgecolors="black",
+    main_ax.hlines(
+        fib_levels,
+        0,
+        1,
+        transform=main_ax.get_yaxis_transform(),
+        linestyle="dotted",
+        color="purple",
+        linewidth=1,
+        label=f"Fib {' / '.join(fib_labels)}",
+    )
+    main_markers = [
+        (
+            date_nums[golden_cross],
+            close_values[golden_cross],
+            "green",
+            "^",
+            "Golden Cross",
+        ),
+        (date_nums[death_cross], close_values[death_cross], "red", "v", "Death Cross"),
+        (date_nums[max_idx : max_idx + 1], [max_price], "gold", "o", "Max Price"),
+        (date_nums[min_idx : min_idx + 1], [min_price], "crimson", "o", "Min Price"),
+    ]
+    # Move the buy/sell signals slightly to the right for better visibility
+    signal_date = date_nums[-1] + 10
+    fib_buy = close_values[-1] > fib_levels
+    fib_sell = close_values[-1] < fib_levels
+    if fib_buy.any():
+        main_markers.append(
+            (
+                np.full(int(fib_buy.sum()), signal_date),
+                fib_levels[fib_buy],
+                "green",
+                "^",
+                f"Buy Signal (Fib {', '.join(fib_labels[fib_buy])})",
             )
-        elif company_close_prices.iloc[-1] < value:
-            main_ax.scatter(
-                signal_date,
-                value,
-                color="red",
-                marker="v",
-                label=f"Sell Signal (Fib {level * 100:.1f}%)",
-                edgecolors="black",
+        )
+    if fib_sell.any():
+        main_markers.append(
+            (
+                np.full(int(fib_sell.sum()), signal_date),
+                fib_levels[fib_sell],
+                "red",
+                "v",
+                f"Sell Signal (Fib {', '.join(fib_labels[fib_sell])})",
             )
+        )
+    main_marker_handles = _scatter_markers(main_ax, main_markers)
 
     base_title = f"{symbol} | {short_window} / {long_window} day MA | {period}"
     if annual_volatility == NA_ANNUAL_VOLATILITY:
@@ -171,27 +306,15 @@ def plot_stock_data(
         )
     main_ax.set_xlabel("Date")
     main_ax.set_ylabel("Price")
-    main_ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
+    main_ax.xaxis_date()
+    main_ax.xaxis.set_major_formatter(date_formatter)
     main_ax.tick_params(axis="x", rotation=45)
-    main_ax.legend()
+    main_ax.legend(handles=main_ax.get_legend_handles_labels()[0] + main_marker_handles)
     main_ax.grid(False)
-    main_closing_cursor = mplcursors.cursor(main_closing_line, hover=True)
-    main_closing_cursor.connect(
-        event="add",
-        func=lambda sel: [
-            sel.annotation.set_text(
-                f"{mdates.num2date(sel.target[0]).strftime('%Y-%m-%d')} : {sel.target[1]:.2f}"
-            ),
-            sel.annotation.set_bbox(
-                dict(boxstyle="round,pad=0.3", edgecolor="black", facecolor="white")
-            ),
-        ],
-    )
 
     # Plotting RSI
-    rsi_line = rsi_ax.plot(
-        company_history.index,
-        rsi,
+    rsi_ax.plot(
+        *downsample(date_nums, rsi),
         label="Relative Strength Index (RSI)",
         color="cornflowerblue",
         linewidth=1,
@@ -200,54 +323,32 @@ def plot_stock_data(
     rsi_ax.axhline(30, color="forestgreen", linestyle="dotted", label="Oversold (30)")
     rsi_ax.set_xlabel("Date")
     rsi_ax.set_ylabel("RSI")
-    rsi_ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
+    rsi_ax.xaxis_date()
+    rsi_ax.xaxis.set_major_formatter(date_formatter)
     rsi_ax.tick_params(axis="x", rotation=45)
     rsi_ax.legend()
     rsi_ax.grid(False)
-    rsi_cursor = mplcursors.cursor(rsi_line, hover=True)
-    rsi_cursor.connect(
-        event="add",
-        func=lambda sel: [
-            sel.annotation.set_text(
-                f"{mdates.num2date(sel.target[0]).strftime('%Y-%m-%d')} : {sel.target[1]:.2f}"
-            ),
-            sel.annotation.set_bbox(
-                dict(boxstyle="round,pad=0.3", edgecolor="black", facecolor="white")
-            ),
-            sel.annotation.update(
-                {
-                    "color": "forestgreen"
-                    if sel.target[1] <= 30
-                    else "tomato"
-                    if sel.target[1] >= 70
-                    else "cornflowerblue"
-                }
-            ),
-        ],
-    )
 
     # Plotting Volume
-    volume_line = volume_ax.bar(
-        company_history.index, company_volume, color="darkgray", label="Volume"
-    )
+    volume_ax.bar(date_nums, volume_values, color="darkgray", label="Volume")
     volume_ax.plot(
-        company_history.index,
-        company_volume.rolling(window=5).mean(),
+        date_nums,
+        calculate_moving_average(volume_values, 5),
         label="5 day Volume MA",
         color="blue",
         linestyle="dashed",
         linewidth=1,
     )
     volume_ax.plot(
-        company_history.index,
-        company_volume.rolling(window=50).mean(),
+        date_nums,
+        calculate_moving_average(volume_values, 50),
         label="50 day Volume MA",
         color="red",
         linestyle="dashed",
         linewidth=1,
     )
     volume_ax.axhline(
-        company_volume.mean(),
+        np.nanmean(volume_values),
         color="green",
         linestyle="dashed",
         linewidth=1,
@@ -255,78 +356,78 @@ def plot_stock_data(
     )
     volume_ax.set_xlabel("Date")
     volume_ax.set_ylabel("Volume")
-    volume_ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
+    volume_ax.xaxis_date()
+    volume_ax.xaxis.set_major_formatter(date_formatter)
     volume_ax.tick_params(axis="x", rotation=45)
     volume_ax.legend()
     volume_ax.grid(False)
-    volume_cursor = mplcursors.cursor(volume_line, hover=True)
-    volume_cursor.connect(
-        event="add",
-        func=lambda sel: [
-            sel.annotation.set_text(
-                f"{mdates.num2date(sel.target[0]).strftime('%Y-%m-%d')} : {sel.target[1]:.2f}"
-            ),
-            sel.annotation.set_bbox(
-                dict(boxstyle="round,pad=0.3", edgecolor="black", facecolor="white")
-            ),
-        ],
-    )
 
     # Plotting MACD
-    macd_line = macd_ax.plot(
-        company_history.index, macd, label="MACD", color="blue", linewidth=1
-    )
+    macd_ax.plot(*downsample(date_nums, macd), label="MACD", color="blue", linewidth=1)
     macd_ax.plot(
-        company_history.index,
-        signal_line,
+        *downsample(date_nums, signal_line),
         label="Signal Line",
         color="red",
         linestyle="dashed",
         linewidth=1,
     )
-    golden_cross_macd = (macd.shift(1) < signal_line.shift(1)) & (macd > signal_line)
-    death_cross_macd = (macd.shift(1) > signal_line.shift(1)) & (macd < signal_line)
-    macd_ax.scatter(
-        company_history.index[golden_cross_macd],
-        macd[golden_cross_macd],
-        color="green",
-        marker="^",
-        label="MACD Golden Cross",
-        edgecolors="black",
-    )
-    macd_ax.scatter(
-        company_history.index[death_cross_macd],
-        macd[death_cross_macd],
-        color="red",
-        marker="v",
-        label="MACD Death Cross",
-        edgecolors="black",
+    macd_crosses = calculate_crosses(macd, signal_line)
+    golden_cross_macd = np.nonzero(macd_crosses == 1)[0]
+    death_cross_macd = np.nonzero(macd_crosses == -1)[0]
+    macd_marker_handles = _scatter_markers(
+        macd_ax,
+        [
+            (
+                date_nums[golden_cross_macd],
+                macd[golden_cross_macd],
+                "green",
+                "^",
+                "MACD Golden Cross",
+            ),
+            (
+                date_nums[death_cross_macd],
+                macd[death_cross_macd],
+                "red",
+                "v",
+                "MACD Death Cross",
+            ),
+        ],
     )
     macd_ax.axhline(5, color="gray", linestyle="dotted", linewidth=0.5)
     # Add horizontal lines at intervals of 5, starting from 10, only if the MACD value exceeds the previous threshold
-    for value in range(10, 55, 5):
-        if macd.max() > value - 5:
-            macd_ax.axhline(value, color="gray", linestyle="dotted", linewidth=0.5)
+    macd_levels = np.arange(10, 55, 5)
+    macd_levels = macd_levels[macd_levels - 5 < np.nanmax(macd)]
+    if len(macd_levels):
+        macd_ax.hlines(
+            macd_levels,
+            0,
+            1,
+            transform=macd_ax.get_yaxis_transform(),
+            color="gray",
+            linestyle="dotted",
+            linewidth=0.5,
+        )
     macd_ax.set_xlabel("Date")
     macd_ax.set_ylabel("MACD")
-    macd_ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
+    macd_ax.xaxis_date()
+    macd_ax.xaxis.set_major_formatter(date_formatter)
     macd_ax.tick_params(axis="x", rotation=45)
-    macd_ax.legend()
+    macd_ax.legend(handles=macd_ax.get_legend_handles_labels()[0] + macd_marker_handles)
     macd_ax.grid(False)
-    macd_cursor = mplcursors.cursor(macd_line, hover=True)
-    macd_cursor.connect(
-        event="add",
-        func=lambda sel: [
-            sel.annotation.set_text(
-                f"{mdates.num2date(sel.target[0]).strftime('%Y-%m-%d')} : {sel.target[1]:.2f}"
-            ),
-            sel.annotation.set_bbox(
-                dict(boxstyle="round,pad=0.3", edgecolor="black", facecolor="white")
-            ),
-        ],
-    )
 
     plt.tight_layout()
+    if interactive:
+        _connect_hover(
+            fig,
+            date_nums,
+            date_strs,
+            {
+                main_ax: (close_values, None),
+                rsi_ax: (rsi, _rsi_color),
+                volume_ax: (volume_values, None),
+                macd_ax: (macd, None),
+            },
+        )
     plt.show(block=False)
 
 
@@ -380,13 +481,25 @@ def main() -> int:
     else:
         config = config_from_dialog()
 
-    for symbol in config.symbols:
+    # Fetch concurrently (network bound), but plot on the main thread since
+    # matplotlib is not thread-safe.
+    max_workers = max(1, min(MAX_FETCH_WORKERS, len(config.symbols)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        histories = list(
+            executor.map(
+                fetch_history,
+                config.symbols,
+                repeat(config.start),
+                repeat(config.end),
+            )
+        )
+
+    for symbol, company_history in zip(config.symbols, histories):
         plot_stock_data(
             symbol,
+            company_history,
             config.period,
             config.period_in_days,
-            config.start,
-            config.end,
             config.short,
             config.long,
             figsize=config.figsize,
@@ -1,19 +1,249 @@
+import functools
+import numpy as np
 import pandas as pd
+from numba import njit, types
 
+# Kernels are declared with explicit signatures so they are compiled (or loaded
+# from the on-disk cache) at import time instead of on the first call. Inputs
+# are typed read-only so Copy-on-Write views from pandas are accepted as-is.
+_F4_IN = types.Array(types.float32, 1, "A", readonly=True)
+_F8_IN = types.Array(types.float64, 1, "A", readonly=True)
 
-def calculate_rsi(prices, window=14):
-    delta = prices.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+# Prices need far less than float32 precision; halving the width halves the
+# memory traffic of the kernels. Accumulators inside the kernels stay float64.
+PRICE_DTYPE = np.float32
 
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
 
+def _like(values, prices):
+    # Indicators accept a Series or a plain ndarray and answer in kind, so
+    # callers doing pure array math don't pay for Series construction.
+    if isinstance(prices, pd.Series):
+        return pd.Series(values, index=prices.index)
+    return values
 
-def calculate_macd(prices: pd.Series, short_window=12, long_window=26, signal_window=9):
-    short_ema = prices.ewm(span=short_window, adjust=False).mean()
-    long_ema = prices.ewm(span=long_window, adjust=False).mean()
-    macd = short_ema - long_ema
-    signal = macd.ewm(span=signal_window, adjust=False).mean()
+
+@njit(types.float64(types.float64, types.float64), cache=True)
+def _rsi_value(avg_gain, avg_loss):
+    if avg_loss == 0.0:
+        # No losses in the window: RSI saturates at 100, or is undefined if flat.
+        return 100.0 if avg_gain > 0.0 else np.nan
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit(
+    [
+        types.float32[:](_F4_IN, types.int64),
+        types.float64[:](_F8_IN, types.int64),
+    ],
+    cache=True,
+)
+def _rsi_core(p, window):
+    n = p.shape[0]
+    out = np.empty_like(p)
+    out[:] = np.nan
+
+    # Seed the averages with the simple mean of `window` changes, then apply
+    # Wilder's smoothing. A NaN price breaks the chain: every window touching
+    # it stays NaN and the averages are re-seeded from the next valid changes.
+    seeded = 0
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n):
+        d = p[i] - p[i - 1]
+        if np.isnan(d):
+            seeded = 0
+            avg_gain = 0.0
+            avg_loss = 0.0
+            continue
+        gain = d if d > 0 else 0.0
+        loss = -d if d < 0 else 0.0
+        if seeded < window:
+            avg_gain += gain
+            avg_loss += loss
+            seeded += 1
+            if seeded < window:
+                continue
+            avg_gain /= window
+            avg_loss /= window
+        else:
+            avg_gain = (avg_gain * (window - 1) + gain) / window
+            avg_loss = (avg_loss * (window - 1) + loss) / window
+        out[i] = _rsi_value(avg_gain, avg_loss)
+    return out
+
+
+# RSI and MACD are memoized on the exact price bytes, so re-plotting the same
+# symbol (e.g. in a notebook) skips the kernels. Keying on the full buffer
+# rather than a fingerprint rules out false hits; callers get a copy so the
+# cached arrays can't be mutated.
+@functools.lru_cache(maxsize=32)
+def _cached_rsi(price_bytes: bytes, window: int):
+    return _rsi_core(np.frombuffer(price_bytes, dtype=PRICE_DTYPE), window)
+
+
+def calculate_rsi(prices: pd.Series | np.ndarray, window=14):
+    price_bytes = np.asarray(prices, dtype=PRICE_DTYPE).tobytes()
+    rsi = _cached_rsi(price_bytes, window).copy()
+    return _like(rsi, prices)
+
+
+@njit(
+    [
+        types.UniTuple(types.float32[:], 2)(
+            _F4_IN, types.float64, types.float64, types.float64
+        ),
+        types.UniTuple(types.float64[:], 2)(
+            _F8_IN, types.float64, types.float64, types.float64
+        ),
+    ],
+    cache=True,
+)
+def _macd_core(p, alpha_short, alpha_long, alpha_signal):
+    n = p.shape[0]
+    macd = np.empty_like(p)
+    signal = np.empty_like(p)
+    if n == 0:
+        return macd, signal
+
+    # Mirrors ewm(adjust=False): each EMA starts at its first valid price, and
+    # a NaN holds the state while the weight of the old value keeps decaying,
+    # so the next price gets its full catch-up weight. The signal line runs
+    # over the held MACD, exactly as macd.ewm() would see it.
+    started = False
+    short_ema = long_ema = signal_ema = m = 0.0
+    short_wt = long_wt = 1.0
+    for i in range(n):
+        x = p[i]
+        if not started:
+            if np.isnan(x):
+                macd[i] = np.nan
+                signal[i] = np.nan
+                continue
+            started = True
+            short_ema = long_ema = np.float64(x)
+        else:
+            short_wt *= 1.0 - alpha_short
+            long_wt *= 1.0 - alpha_long
+            if not np.isnan(x):
+                short_ema += alpha_short / (short_wt + alpha_short) * (x - short_ema)
+                long_ema += alpha_long / (long_wt + alpha_long) * (x - long_ema)
+                short_wt = long_wt = 1.0
+                m = short_ema - long_ema
+            signal_ema += alpha_signal * (m - signal_ema)
+        macd[i] = m
+        signal[i] = signal_ema
     return macd, signal
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_macd(
+    price_bytes: bytes, short_window: int, long_window: int, signal_window: int
+):
+    # Equivalent to ewm(span=window, adjust=False) for each of the three EMAs.
+    return _macd_core(
+        np.frombuffer(price_bytes, dtype=PRICE_DTYPE),
+        2.0 / (short_window + 1),
+        2.0 / (long_window + 1),
+        2.0 / (signal_window + 1),
+    )
+
+
+def calculate_macd(
+    prices: pd.Series | np.ndarray, short_window=12, long_window=26, signal_window=9
+):
+    price_bytes = np.asarray(prices, dtype=PRICE_DTYPE).tobytes()
+    macd, signal = _cached_macd(price_bytes, short_window, long_window, signal_window)
+    return _like(macd.copy(), prices), _like(signal.copy(), prices)
+
+
+def calculate_moving_average(values: pd.Series | np.ndarray, window: int):
+    v = np.asarray(values, dtype=np.float64)
+    if np.isnan(v).any():
+        # A NaN would poison every later cumulative sum.
+        return _like(pd.Series(v).rolling(window=window).mean().to_numpy(), values)
+
+    # Box-window mean from differences of one cumulative sum. Kept in float64
+    # because the running total grows with the series (e.g. volume).
+    c = np.concatenate(([0.0], np.cumsum(v)))
+    ma = np.full(len(v), np.nan)
+    if len(v) >= window:
+        ma[window - 1 :] = (c[window:] - c[:-window]) / window
+    return _like(ma, values)
+
+
+@njit(
+    [
+        types.UniTuple(types.float32[:], 2)(_F4_IN, types.int64),
+        types.UniTuple(types.float64[:], 2)(_F8_IN, types.int64),
+    ],
+    cache=True,
+)
+def _rolling_mean_std_core(x, window):
+    n = x.shape[0]
+    mean = np.empty_like(x)
+    std = np.empty_like(x)
+    mean[:] = np.nan
+    std[:] = np.nan
+
+    # Accumulate around the first valid price to keep sum-of-squares well
+    # conditioned for large price levels.
+    shift = 0.0
+    for i in range(n):
+        if not np.isnan(x[i]):
+            shift = x[i]
+            break
+
+    s = 0.0
+    s2 = 0.0
+    nans = 0
+    for i in range(n):
+        if np.isnan(x[i]):
+            nans += 1
+        else:
+            d = x[i] - shift
+            s += d
+            s2 += d * d
+        if i >= window:
+            if np.isnan(x[i - window]):
+                nans -= 1
+            else:
+                d = x[i - window] - shift
+                s -= d
+                s2 -= d * d
+        if i >= window - 1 and nans == 0:
+            mean[i] = shift + s / window
+            if window > 1:
+                var = (s2 - s * s / window) / (window - 1)
+                std[i] = np.sqrt(var) if var > 0.0 else 0.0
+    return mean, std
+
+
+def calculate_rolling_mean_std(prices: pd.Series | np.ndarray, window=20):
+    mean, std = _rolling_mean_std_core(np.asarray(prices, dtype=PRICE_DTYPE), window)
+    return _like(mean, prices), _like(std, prices)
+
+
+@njit(
+    [types.int8[:](_F4_IN, _F4_IN), types.int8[:](_F8_IN, _F8_IN)],
+    cache=True,
+)
+def _crosses_core(a, b):
+    n = a.shape[0]
+    out = np.zeros(n, dtype=np.int8)
+    prev_sign = 0
+    for i in range(n):
+        d = a[i] - b[i]
+        # NaN compares false both ways, so gaps reset the sign to 0.
+        sign = (d > 0) - (d < 0)
+        if sign * prev_sign < 0:
+            out[i] = sign
+        prev_sign = sign
+    return out
+
+
+def calculate_crosses(fast, slow):
+    # +1 where `fast` crosses above `slow` (golden), -1 where it crosses below
+    # (death), 0 elsewhere.
+    return _crosses_core(
+        np.asarray(fast, dtype=PRICE_DTYPE), np.asarray(slow, dtype=PRICE_DTYPE)
+    )
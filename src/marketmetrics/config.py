@@ -5,6 +5,9 @@ from typing import List, Optional
 from datetime import datetime, timedelta
 import re
 
+# Match patterns like "2d", "14d", "4m", "4mo", "3y"
+_PERIOD_RE = re.compile(r"(\d+)(d|mo?|y)")
+
 
 @dataclass
 class Config:
@@ -18,23 +21,23 @@ class Config:
     figsize: tuple
 
     def __post_init__(self):
-        self.end = datetime.now().strftime("%Y-%m-%d")
-        self.start = self._calculate_start_date(self.period)
+        now = datetime.now()
+        self.end = now.strftime("%Y-%m-%d")
+        self.start = self._calculate_start_date(self.period, now)
         self.period_in_days = (
             datetime.strptime(self.end, "%Y-%m-%d")
             - datetime.strptime(self.start, "%Y-%m-%d")
         ).days
 
-    def _calculate_start_date(self, period: str) -> Optional[str]:
-        current_date = datetime.now()
-
+    def _calculate_start_date(
+        self, period: str, current_date: datetime
+    ) -> Optional[str]:
         if period == "ytd":
             return f"{current_date.year}-01-01"
         elif period == "max":
             return "1990-01-01"  # Arbitrary early date for maximum range
 
-        # Match patterns like "2d", "14d", "4mo", "3y"
-        match = re.match(r"(\d+)([dmy])", period)
+        match = _PERIOD_RE.fullmatch(period)
         if not match:
             raise ValueError(f"Invalid period format: {period}")
 
@@ -43,7 +46,7 @@ class Config:
         # Convert the unit to a timedelta
         if unit == "d":  # Days
             delta = timedelta(days=value)
-        elif unit == "m":  # Months (approximated as 30 days per month)
+        elif unit in ("m", "mo"):  # Months (approximated as 30 days per month)
             delta = timedelta(days=value * 30)
         elif unit == "y":  # Years (approximated as 365 days per year)
             delta = timedelta(days=value * 365)
@@ -0,0 +1,68 @@
+import numpy as np
+from numba import njit, types
+from .calculator import _F4_IN, _F8_IN
+
+# Series longer than LTTB_THRESHOLD points are reduced to LTTB_POINTS before
+# plotting; the figure is at most a couple of thousand pixels wide anyway.
+LTTB_THRESHOLD = 2000
+LTTB_POINTS = 1000
+
+
+@njit(
+    [
+        types.int64[:](_F8_IN, _F4_IN, types.int64),
+        types.int64[:](_F8_IN, _F8_IN, types.int64),
+    ],
+    cache=True,
+)
+def _lttb_core(x, y, n_out):
+    # Largest-Triangle-Three-Buckets: keep the first and last points and, from
+    # each bucket in between, the point forming the largest triangle with the
+    # previously kept point and the average of the next bucket.
+    n = x.shape[0]
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[n_out - 1] = n - 1
+    bucket_size = (n - 2) / (n_out - 2)
+
+    a = 0
+    for i in range(n_out - 2):
+        avg_start = int((i + 1) * bucket_size) + 1
+        avg_end = min(int((i + 2) * bucket_size) + 1, n)
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(avg_start, avg_end):
+            avg_x += x[j]
+            avg_y += y[j]
+        avg_x /= avg_end - avg_start
+        avg_y /= avg_end - avg_start
+
+        range_start = int(i * bucket_size) + 1
+        range_end = int((i + 1) * bucket_size) + 1
+        max_area = -1.0
+        next_a = range_start
+        for j in range(range_start, range_end):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > max_area:
+                max_area = area
+                next_a = j
+        selected[i + 1] = next_a
+        a = next_a
+    return selected
+
+
+def downsample(x, y, threshold=LTTB_THRESHOLD, n_out=LTTB_POINTS):
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) <= threshold:
+        return x, y
+
+    # NaN points (e.g. the warm-up of a moving average) are not drawn anyway.
+    if np.isnan(y).any():
+        valid = np.flatnonzero(~np.isnan(y))
+        x, y = x[valid], y[valid]
+        if len(x) <= n_out:
+            return x, y
+
+    selected = _lttb_core(x, y, n_out)
+    return x[selected], y[selected]
@@ -0,0 +1,42 @@
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+import pandas as pd
+import yfinance as yf
+
+
+CACHE_DIR = Path.home() / ".cache" / "marketmetrics"
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+def _cache_path(symbol: str, start: str, end: str) -> Path:
+    key = hashlib.md5(f"{symbol}|{start}|{end}".encode()).hexdigest()
+    return CACHE_DIR / f"{key}.parquet"
+
+
+def fetch_history(symbol: str, start: str, end: str) -> pd.DataFrame:
+    cache_path = _cache_path(symbol, start, end)
+    if (
+        cache_path.exists()
+        and time.time() - cache_path.stat().st_mtime < CACHE_TTL_SECONDS
+    ):
+        return pd.read_parquet(cache_path, engine="pyarrow")
+
+    company = yf.Ticker(symbol)
+    history = company.history(interval="1d", start=start, end=end)
+    # Don't cache failed lookups (e.g. unknown symbols) so they are retried.
+    if not history.empty:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # A unique temp file per writer, so threads fetching the same symbol
+        # never share one; the last os.replace wins with a complete file.
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        os.close(fd)
+        try:
+            history.to_parquet(tmp_path, engine="pyarrow", compression="zstd")
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    return history
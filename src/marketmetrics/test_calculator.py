@@ -1,5 +1,14 @@
+import pytest
 import pandas as pd
-from .calculator import calculate_rsi, calculate_macd
+import numpy as np
+from .calculator import (
+    _cached_rsi,
+    calculate_rsi,
+    calculate_macd,
+    calculate_rolling_mean_std,
+    calculate_moving_average,
+    calculate_crosses,
+)
 
 
 def test_calculate_rsi():
@@ -34,3 +43,108 @@ def test_calculate_macd_edge_case():
     macd, signal = calculate_macd(prices)
     assert (macd == 0).all(), "MACD should be 0 for a flat price series"
     assert (signal == 0).all(), "Signal line should be 0 for a flat price series"
+
+
+def test_calculate_rsi_wilder_smoothing():
+    prices = pd.Series([1.0, 2.0, 1.0, 2.0])
+    rsi = calculate_rsi(prices, window=2)
+    assert rsi[:2].isna().all(), "RSI should be NaN until the window is filled"
+    assert rsi.iloc[2] == pytest.approx(50.0)
+    assert rsi.iloc[3] == pytest.approx(75.0)
+
+
+def test_calculate_rsi_nan_gap():
+    prices = pd.Series([1.0, 2.0, 1.0, 2.0, np.nan, 2.0, 1.0, 2.0, 1.0])
+    rsi = calculate_rsi(prices, window=2)
+    assert rsi.iloc[3] == pytest.approx(75.0)
+    # Windows touching the gap are NaN until two valid changes re-seed RSI.
+    assert rsi[4:7].isna().all(), "RSI should be NaN across a price gap"
+    assert rsi.iloc[7] == pytest.approx(50.0)
+    assert rsi.iloc[8] == pytest.approx(25.0)
+
+
+def test_calculate_macd_matches_ewm():
+    prices = pd.Series([10.0, 12.5, 11.0, 13.0, 12.0, 15.5, 14.0, 16.0, 15.0, 17.5])
+    macd, signal = calculate_macd(prices)
+    expected_macd = (
+        prices.ewm(span=12, adjust=False).mean()
+        - prices.ewm(span=26, adjust=False).mean()
+    )
+    expected_signal = expected_macd.ewm(span=9, adjust=False).mean()
+    pd.testing.assert_series_equal(macd, expected_macd, check_dtype=False)
+    pd.testing.assert_series_equal(signal, expected_signal, check_dtype=False)
+
+
+def test_calculate_macd_nan_gap_matches_ewm():
+    prices = pd.Series(
+        [np.nan, 10.0, 12.5, 11.0, np.nan, np.nan, 15.5, 14.0, 16.0, 15.0, 17.5]
+    )
+    macd, signal = calculate_macd(prices)
+    expected_macd = (
+        prices.ewm(span=12, adjust=False).mean()
+        - prices.ewm(span=26, adjust=False).mean()
+    )
+    expected_signal = expected_macd.ewm(span=9, adjust=False).mean()
+    pd.testing.assert_series_equal(macd, expected_macd, check_dtype=False)
+    pd.testing.assert_series_equal(signal, expected_signal, check_dtype=False)
+
+
+def test_calculate_moving_average_matches_pandas():
+    volume = pd.Series([1.2e6, 3.4e6, 2.2e6, 5.1e6, 4.8e6, 0.9e6, 2.7e6])
+    ma = calculate_moving_average(volume, window=3)
+    pd.testing.assert_series_equal(ma, volume.rolling(window=3).mean())
+
+
+def test_calculate_moving_average_short_series():
+    prices = pd.Series([10.0, 11.0])
+    ma = calculate_moving_average(prices, window=5)
+    assert len(ma) == len(prices)
+    assert ma.isna().all(), "MA should be NaN when the window is never filled"
+
+
+def test_calculate_rolling_mean_std_matches_pandas():
+    prices = pd.Series([101.5, 102.0, 99.5, 100.25, 103.0, 104.5, 102.75, 101.0])
+    mean, std = calculate_rolling_mean_std(prices, window=3)
+    expected_mean = prices.rolling(window=3).mean()
+    expected_std = prices.rolling(window=3).std()
+    pd.testing.assert_series_equal(mean, expected_mean, check_dtype=False)
+    pd.testing.assert_series_equal(std, expected_std, check_dtype=False)
+
+
+def test_calculate_rolling_mean_std_edge_case():
+    prices = pd.Series([50.0] * 25)  # Flat prices
+    mean, std = calculate_rolling_mean_std(prices)
+    assert mean[:19].isna().all(), "Mean should be NaN until the window is filled"
+    assert (mean[19:] == 50).all(), "Mean should equal the flat price"
+    assert (std[19:] == 0).all(), "Std should be 0 for a flat price series"
+
+
+def test_calculate_crosses():
+    fast = pd.Series([np.nan, 1.0, 3.0, 3.0, 1.0, 2.0, 2.0, 3.0])
+    slow = pd.Series([np.nan, 2.0, 2.0, 2.0, 2.0, 2.0, 2.0, 2.0])
+    crosses = calculate_crosses(fast, slow)
+    assert crosses.tolist() == [0, 0, 1, 0, -1, 0, 0, 0]
+
+
+def test_calculators_accept_ndarray():
+    prices = np.linspace(10.0, 30.0, 40)
+    rsi = calculate_rsi(prices)
+    macd, signal = calculate_macd(prices)
+    ma = calculate_moving_average(prices, 5)
+    mean, std = calculate_rolling_mean_std(prices)
+    for result in (rsi, macd, signal, ma, mean, std):
+        assert isinstance(result, np.ndarray)
+        assert len(result) == len(prices)
+
+
+def test_calculate_rsi_memoized():
+    prices = pd.Series([44.0, 45.5, 44.25, 46.0, 47.5, 46.75, 48.0, 49.25, 48.5])
+    first = calculate_rsi(prices, window=3)
+    hits = _cached_rsi.cache_info().hits
+    first.iloc[-1] = -1.0  # Mutating a result must not leak into the cache
+    second = calculate_rsi(prices, window=3)
+    assert _cached_rsi.cache_info().hits == hits + 1
+    assert 0 <= second.iloc[-1] <= 100
+    changed = calculate_rsi(prices.iloc[:-1], window=3)
+    assert _cached_rsi.cache_info().hits == hits + 1, "Different prices must miss"
+    assert len(changed) == len(prices) - 1
@@ -22,6 +22,13 @@ from .config import Config
             100,
             (datetime.now() - timedelta(days=90)).strftime("%Y-%m-%d"),
         ),
+        (
+            ["TEST"],
+            "6mo",
+            20,
+            100,
+            (datetime.now() - timedelta(days=180)).strftime("%Y-%m-%d"),
+        ),
         (
             ["TEST"],
             "1y",
@@ -43,6 +50,16 @@ def test_invalid_period():
         Config(symbols=["TEST"], period="invalid", short=20, long=100, figsize=(10, 10))
 
 
+def test_trailing_characters_in_period():
+    with pytest.raises(ValueError, match="Invalid period format: 2dx"):
+        Config(symbols=["TEST"], period="2dx", short=20, long=100, figsize=(10, 10))
+
+
+def test_trailing_newline_in_period():
+    with pytest.raises(ValueError, match="Invalid period format"):
+        Config(symbols=["TEST"], period="2d\n", short=20, long=100, figsize=(10, 10))
+
+
 def test_unknown_time_unit():
     with pytest.raises(ValueError, match="Invalid period format: 5w"):
         Config(symbols=["TEST"], period="5w", short=20, long=100, figsize=(10, 10))
@@ -64,3 +81,19 @@ def test_config_delta_days(period, expected_period_in_days):
         symbols=["TEST"], period=period, short=20, long=100, figsize=(10, 10)
     )
     assert config.period_in_days == expected_period_in_days
+
+
+@pytest.mark.parametrize(
+    "period, expected_start",
+    [
+        ("ytd", "2024-01-01"),
+        ("max", "1990-01-01"),
+        ("10d", "2024-02-19"),
+        ("2mo", "2023-12-31"),
+        ("1y", "2023-03-01"),
+    ],
+)
+def test_calculate_start_date_from_fixed_now(period, expected_start):
+    config = Config(symbols=["TEST"], period="1y", short=20, long=100, figsize=(10, 10))
+    now = datetime(2024, 2, 29)
+    assert config._calculate_start_date(period, now) == expected_start
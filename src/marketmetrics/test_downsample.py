@@ -0,0 +1,31 @@
+import numpy as np
+from .downsample import downsample
+
+
+def test_downsample_short_series():
+    x = np.arange(100, dtype=np.float64)
+    y = np.sin(x)
+    x_ds, y_ds = downsample(x, y)
+    assert len(x_ds) == len(x), "Short series should not be downsampled"
+    np.testing.assert_array_equal(y_ds, y)
+
+
+def test_downsample_long_series():
+    x = np.arange(5000, dtype=np.float64)
+    y = np.sin(x / 100).astype(np.float32)
+    y[2500] = 10.0  # Spike
+    x_ds, y_ds = downsample(x, y)
+    assert len(x_ds) == len(y_ds) == 1000
+    assert x_ds[0] == x[0] and x_ds[-1] == x[-1], "Endpoints should be kept"
+    assert np.all(np.diff(x_ds) > 0), "Points should stay in order"
+    assert y_ds.max() == 10.0, "Extremes should survive downsampling"
+
+
+def test_downsample_skips_nan():
+    x = np.arange(5000, dtype=np.float64)
+    y = np.cos(x / 100)
+    y[:200] = np.nan  # Moving average warm-up
+    x_ds, y_ds = downsample(x, y)
+    assert len(x_ds) == 1000
+    assert x_ds[0] == 200
+    assert not np.isnan(y_ds).any()
@@ -0,0 +1,62 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+from . import history
+from .history import fetch_history
+
+
+class FakeTicker:
+    calls = 0
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def history(self, interval, start, end):
+        FakeTicker.calls += 1
+        index = pd.date_range(start, end, freq="D", tz="America/New_York")
+        return pd.DataFrame(
+            {"Close": range(len(index)), "Volume": range(len(index))},
+            index=index,
+            dtype="float64",
+        )
+
+
+@pytest.fixture(autouse=True)
+def fake_ticker(monkeypatch, tmp_path):
+    FakeTicker.calls = 0
+    monkeypatch.setattr(history, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(history.yf, "Ticker", FakeTicker)
+
+
+def test_fetch_history_uses_cache():
+    first = fetch_history("TEST", "2024-01-01", "2024-01-10")
+    second = fetch_history("TEST", "2024-01-01", "2024-01-10")
+    assert FakeTicker.calls == 1
+    pd.testing.assert_frame_equal(first, second, check_freq=False)
+
+
+def test_fetch_history_key_includes_range():
+    fetch_history("TEST", "2024-01-01", "2024-01-10")
+    fetch_history("TEST", "2024-01-02", "2024-01-10")
+    assert FakeTicker.calls == 2
+
+
+def test_fetch_history_expired_cache():
+    fetch_history("TEST", "2024-01-01", "2024-01-10")
+    cache_path = history._cache_path("TEST", "2024-01-01", "2024-01-10")
+    expired = cache_path.stat().st_mtime - history.CACHE_TTL_SECONDS - 1
+    os.utime(cache_path, (expired, expired))
+    fetch_history("TEST", "2024-01-01", "2024-01-10")
+    assert FakeTicker.calls == 2
+
+
+def test_fetch_history_concurrent_same_key(tmp_path):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(
+                lambda _: fetch_history("TEST", "2024-01-01", "2024-01-10"), range(16)
+            )
+        )
+    assert all(len(r) == len(results[0]) for r in results)
+    assert not list(tmp_path.glob("*.tmp")), "temp files should not be left behind"
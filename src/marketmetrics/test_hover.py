@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from . import _connect_hover
+
+
+@pytest.fixture
+def hover_fig():
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    price_ax, rsi_ax = fig.subplots(2)
+    x = np.arange(10.0)
+    prices = np.linspace(100.0, 109.0, 10)
+    rsi = np.full(10, 50.0)
+    rsi[:3] = np.nan
+    price_ax.plot(x, prices)
+    rsi_ax.plot(x, rsi)
+    labels = [f"day{i}" for i in range(10)]
+    series = {price_ax: (prices, None), rsi_ax: (rsi, lambda _: "green")}
+    return fig, x, labels, series
+
+
+def _annotations(ax):
+    return [c for c in ax.get_children() if type(c).__name__ == "Annotation"]
+
+
+def _move(fig, ax, x, y):
+    px, py = ax.transData.transform((x, y))
+    event = MouseEvent("motion_notify_event", fig.canvas, px, py)
+    fig.canvas.callbacks.process("motion_notify_event", event)
+
+
+def test_hover_blit(hover_fig, monkeypatch):
+    fig, x, labels, series = hover_fig
+    price_ax, rsi_ax = series
+    _connect_hover(fig, x, labels, series)
+    fig.canvas.draw()
+    draws = []
+    monkeypatch.setattr(fig.canvas, "draw_idle", lambda: draws.append(1))
+
+    _move(fig, price_ax, 4.2, 104.0)
+    (annotation,) = _annotations(price_ax)
+    assert annotation.get_visible()
+    assert annotation.get_animated()
+    assert annotation.get_text() == "day4 : 104.00"
+
+    _move(fig, rsi_ax, 6.8, 50.0)
+    (rsi_annotation,) = _annotations(rsi_ax)
+    assert not annotation.get_visible()
+    assert rsi_annotation.get_text() == "day7 : 50.00"
+    assert rsi_annotation.get_color() == "green"
+    assert not draws, "blitting should not trigger a full redraw"
+
+
+def test_hover_skips_nan(hover_fig):
+    fig, x, labels, series = hover_fig
+    rsi_ax = list(series)[1]
+    _connect_hover(fig, x, labels, series)
+    fig.canvas.draw()
+
+    _move(fig, rsi_ax, 1.0, 50.0)
+    (annotation,) = _annotations(rsi_ax)
+    assert not annotation.get_visible()
+
+
+def test_hover_without_blit(hover_fig, monkeypatch):
+    fig, x, labels, series = hover_fig
+    price_ax = list(series)[0]
+    monkeypatch.setattr(type(fig.canvas), "supports_blit", False)
+    _connect_hover(fig, x, labels, series)
+    fig.canvas.draw()
+    draws = []
+    monkeypatch.setattr(fig.canvas, "draw_idle", lambda: draws.append(1))
+
+    _move(fig, price_ax, 8.9, 108.0)
+    (annotation,) = _annotations(price_ax)
+    assert annotation.get_visible()
+    assert not annotation.get_animated()
+    assert annotation.get_text() == "day9 : 109.00"
+    assert annotation.get_horizontalalignment() == "right"
+    assert draws == [1]
+
+    # Staying on the same point doesn't redraw again.
+    _move(fig, price_ax, 9.0, 108.0)
+    assert draws == [1]